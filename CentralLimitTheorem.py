@@ -9,31 +9,92 @@
     sampling distribution of sample proportion follows normal distribution
 '''
 import numpy as np
+import math
+import sys
+import matplotlib
+
+headless = '--headless' in sys.argv  # Save the figure to a file instead of opening a window
+if headless:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from scipy.stats import norm
+
+try:
+    from joblib import Parallel, delayed
+except ImportError:  # Draw the samples sequentially when joblib is not installed
+    Parallel = None
+
+try:
+    from numba import njit
+except ImportError:  # Fall back to plain Python when numba is not installed
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 # Parameters
 population_mean = 50
 sample_size = 40
 num_samples = 1000
+n_jobs = 4  # Number of workers drawing samples in parallel
+parallel_threshold = 100000  # Below this many samples starting the workers costs more than drawing sequentially
 
 # Generate population data (exponential distribution for skewed data)
 population_data = np.random.exponential(scale=population_mean, size=10000)
 
 print("-----Start statistics for population from data-----")
-population_mean_actual = np.mean(population_data)
-population_std_actual = np.std(population_data)
+
+
+@njit(cache=True)
+def mean_std(data):
+    """
+    Calculate the mean and population standard deviation in a single pass (Welford's online algorithm).
+    :param data: array of data
+    :return: Tuple of mean and standard deviation
+    """
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    for value in data:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+
+    return mean, math.sqrt(m2 / count)
+
+
+population_mean_actual, population_std_actual = mean_std(population_data)
 
 print(f'Population Mean: {population_mean_actual:.2f}')
 print(f'Population Std Dev: {population_std_actual:.2f}')
 print("-----End statistics for population from data-----\n\n")
 
 print("-----Start statistics for sample mean-----")
-# Collect sample means
-sample_means = []
-for _ in range(num_samples):
-    sample = np.random.choice(population_data, sample_size)
-    sample_means.append(np.mean(sample))
+
+
+def draw_sample_means(seed, n):
+    """
+    Draw samples from the population and reduce each sample to its mean.
+    :param seed: Seed for the worker's random generator
+    :param n: Number of samples to draw
+    :return: array of sample means
+    """
+    rng = np.random.default_rng(seed)
+    # Sampling with replacement and equal weights is uniform random indexing
+    idx = rng.integers(0, population_data.size, size=(n, sample_size))
+    samples = population_data[idx]
+    return samples.mean(axis=1)
+
+
+# Split the samples between the workers, each with an independent random stream
+# The streams are seeded from the global generator so np.random.seed keeps the sample means reproducible
+chunk_sizes = [num_samples // n_jobs + (i < num_samples % n_jobs) for i in range(n_jobs)]
+seeds = np.random.SeedSequence(np.random.randint(2 ** 32, dtype=np.int64)).spawn(n_jobs)
+
+# Collect sample means, workers return only the means not the raw samples
+if Parallel is None or num_samples < parallel_threshold:
+    chunks = [draw_sample_means(seed, size) for seed, size in zip(seeds, chunk_sizes)]
+else:
+    chunks = Parallel(n_jobs=n_jobs)(delayed(draw_sample_means)(seed, size) for seed, size in zip(seeds, chunk_sizes))
+sample_means = np.concatenate(chunks)
 
 # Calculate statistics for sample means
 mean_of_sample_means = np.mean(sample_means)
@@ -53,13 +114,27 @@ print(f'Std Dev by CLT: {clt_std:.2f}')
 print("-----End statistics by CLT-----\n\n")
 
 print("-----Start Visualizing-----")
+
+
+def normal_pdf(x, mean, std):
+    """
+    Calculate the normal probability density function without the scipy.stats wrapper.
+    :param x: values to evaluate
+    :param mean: mean of the distribution
+    :param std: standard deviation of the distribution
+    :return: density at the values
+    """
+    inv_std = 1.0 / std
+    return np.exp(-0.5 * ((x - mean) * inv_std) ** 2) * (inv_std * 0.3989422804014327)  # 1 / sqrt(2π)
+
+
 # Plot the population distribution
 plt.figure(figsize=(14, 7))
 
 plt.subplot(1, 2, 1)
 plt.hist(population_data, bins=30, density=True, alpha=0.6, color='skyblue', edgecolor='black')
 x_pop = np.linspace(min(population_data), max(population_data), 100)
-pdf_pop = norm.pdf(x_pop, population_mean_actual, population_std_actual)
+pdf_pop = normal_pdf(x_pop, population_mean_actual, population_std_actual)
 plt.plot(x_pop, pdf_pop, 'k', linewidth=2, label='PDF')
 plt.title('Skewed Population Distribution')
 plt.xlabel('Value')
@@ -75,10 +150,13 @@ plt.ylabel('Density')
 
 # Overlay the normal distribution
 x_sample = np.linspace(min(sample_means), max(sample_means), 100)
-pdf_sample = norm.pdf(x_sample, mean_of_sample_means, std_of_sample_means)
+pdf_sample = normal_pdf(x_sample, mean_of_sample_means, std_of_sample_means)
 plt.plot(x_sample, pdf_sample, 'k', linewidth=2, label='Normal PDF')
 plt.legend([f'Mean: {mean_of_sample_means:.2f}\nStd Dev: {std_of_sample_means:.2f}'])
 
 plt.tight_layout()
-plt.show()
+if headless:
+    plt.savefig('clt.png', dpi=100)
+else:
+    plt.show()
 print("-----End Visualizing-----")
@@ -1,53 +1,114 @@
 import numpy as np
 from scipy import stats as st
+import sys
+import matplotlib
+
+headless = '--headless' in sys.argv  # Save the figure to a file instead of opening a window
+if headless:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+try:
+    from numba import njit
+except ImportError:  # Fall back to plain Python when numba is not installed
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 speed = np.array([99, 86, 87, 88, 111, 86, 103, 87, 94, 78, 77, 85, 86])
 
+
+def percentile_of_sorted(sorted_data, q):
+    """
+    Calculate the percentile from already sorted data using linear interpolation.
+    :param sorted_data: sorted array of data
+    :param q: percentile between 0 and 100
+    :return: value at the percentile
+    """
+    position = q / 100 * (sorted_data.size - 1)
+    lower = int(np.floor(position))
+    upper = int(np.ceil(position))
+    return sorted_data[lower] + (sorted_data[upper] - sorted_data[lower]) * (position - lower)
+
+
+@njit(cache=True)
+def central_moments(data):
+    """
+    Calculate the mean and the 2nd, 3rd and 4th central moments in a single pass (Welford's online algorithm).
+    :param data: array of data
+    :return: Tuple of mean, variance, 3rd central moment and 4th central moment
+    """
+    mean = m2 = m3 = m4 = 0.0
+    count = 0
+    for value in data:
+        prev_count = count
+        count += 1
+        delta = value - mean
+        delta_n = delta / count
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * prev_count
+        mean += delta_n
+        m4 += term1 * delta_n2 * (count * count - 3 * count + 3) + 6 * delta_n2 * m2 - 4 * delta_n * m3
+        m3 += term1 * delta_n * (count - 2) - 3 * delta_n * m2
+        m2 += term1
+
+    return mean, m2 / count, m3 / count, m4 / count
+
+
+# Sort once and derive every order statistic from the sorted array
+speed_sorted = np.sort(speed)
+n = speed_sorted.size
+# Mean and central moments from one pass over the data
+mean, m2, m3, m4 = central_moments(speed)
+
 print("-----Start Central Tendency-----")
-mean = np.mean(speed)
-median = np.median(speed)
-mode = st.mode(speed)[0]
+median = percentile_of_sorted(speed_sorted, 50)
+mode = np.bincount(speed).argmax()
 print("Mean:", mean)
 print("Median:", median)
 print("Mode:", mode)
 print("-----End Central Tendency-----\n\n")
 
 print("-----Start Spread Analysis-----")
-min = np.min(speed)
-max = np.max(speed)
-range = np.ptp(speed)
+min = speed_sorted[0]
+max = speed_sorted[-1]
+range = max - min
 mid_range = range / 2
-q25, q50, q75 = np.percentile(speed, [25, 50, 75])
+q25, q50, q75 = (percentile_of_sorted(speed_sorted, q) for q in (25, 50, 75))
 iqr = q75 - q25
-variance = np.var(speed)
-std = np.std(speed)
-mad_mean = np.mean(np.abs(speed - np.mean(speed)))
-mad_median = np.median(np.abs(speed - np.median(speed)))
+variance = m2
+std = np.sqrt(m2)
+# Absolute deviations share one scratch buffer
+abs_deviation = np.empty_like(speed, dtype=np.float64)
+np.abs(np.subtract(speed, mean, out=abs_deviation), out=abs_deviation)
+mad_mean = abs_deviation.mean()
+np.abs(np.subtract(speed, median, out=abs_deviation), out=abs_deviation)
+mad_median = np.median(abs_deviation, overwrite_input=True)
 print('min', min)
 print('max', max)
 print('range', range)
 print('mid range', mid_range)
-print('25%', np.percentile(speed, 25))
+print('25%', q25)
 print('50%', q50)
 print('75%', q75)
 print('iqr', iqr)
-print('iqr', st.iqr(speed))
 print('variance', variance)
 print('standard deviation', std)
 print('mad(mean)', mad_mean)
 print('mad(median)', mad_median)
-print('mad(median) using function', st.median_abs_deviation(speed))
 print("-----End Spread Analysis-----\n\n")
 
 print("-----Start Data Modeling-----")
-zscore = st.zscore(speed)
-loc = np.where(speed == 86)[0][0]
-percentile_86 = st.percentileofscore(speed, 86)
-ordinal_rank_86 = st.rankdata(speed, method='ordinal')[loc]
-dense_rank_86 = st.rankdata(speed, method='dense')[loc]
-zscore_86 = zscore[loc]
+# Number of values strictly less than and less than or equal to 86
+below_86 = np.searchsorted(speed_sorted, 86, side='left')
+upto_86 = np.searchsorted(speed_sorted, 86, side='right')
+# Dense rank increases by one at the start of every run of equal values
+dense_ranks = np.cumsum(np.concatenate(([True], speed_sorted[1:] != speed_sorted[:-1])))
+# Percentile of the average rank of the tied values, as percentileofscore(kind='rank')
+percentile_86 = (below_86 + upto_86 + (below_86 < upto_86)) * 50 / n
+ordinal_rank_86 = below_86 + 1
+dense_rank_86 = dense_ranks[below_86]
+zscore_86 = (86 - mean) / std
 print('percentile of 86', percentile_86)
 print('ordinal ranking of 86', ordinal_rank_86)
 print('dense ranking of 86', dense_rank_86)
@@ -88,8 +149,8 @@ def shape_interpretation(skewness, kurtosis):
     return skew_desc, kurt_desc
 
 
-skewness = st.skew(speed)
-kurt = st.kurtosis(speed)
+skewness = m3 / m2 ** 1.5
+kurt = m4 / m2 ** 2 - 3
 
 skew_desc, kurt_desc = shape_interpretation(skewness, kurt)
 print(f"Skewness: {skewness:.2f}, {skew_desc}")
@@ -104,15 +165,16 @@ def remove_outliers_iqr(data):
     """
     Remove the outlier using interquartile range method.
     :param data: list of data
-    :return: list of data of removed outlier
+    :return: array of data of removed outlier
     """
+    data = np.asarray(data)
     q25, q75 = np.percentile(data, [25, 75])
     iqr = q75 - q25
     lower_bound = q25 - 1.5 * iqr
     upper_bound = q75 + 1.5 * iqr
 
     print('Removed outliers using IQR')
-    return [val for val in data if lower_bound <= val <= upper_bound]
+    return data[(data >= lower_bound) & (data <= upper_bound)]
 
 
 # Function to remove outliers using Z-score
@@ -121,12 +183,13 @@ def remove_outliers_zscore(data, threshold=3):
     Remove the outlier using z-score method.
     :param data: list of data
     :param threshold: the threshold for identifying outlier
-    :return: list of data of removed outlier
+    :return: array of data of removed outlier
     """
+    data = np.asarray(data)
     z_scores = np.abs(st.zscore(data))
 
     print('Removed outliers using Z-score')
-    return [val for key, val in enumerate(data) if z_scores[key] <= threshold]
+    return data[z_scores <= threshold]
 
 
 # Function to remove outliers using modified Z-score
@@ -135,14 +198,15 @@ def remove_outliers_modified_zscore(data, threshold=3.5):
     Remove the outlier using modified z-score method.
     :param data: list of data
     :param threshold: the threshold for identifying outlier
-    :return: list of data of removed outlier
+    :return: array of data of removed outlier
     """
+    data = np.asarray(data)
     median = np.median(data)
     mad = np.median(np.abs(data - median))
     modified_z_scores = 0.6745 * (data - median) / mad
 
     print('Removed outliers using modified Z-score')
-    return [val for key, val in enumerate(data) if np.abs(modified_z_scores[key]) <= threshold]
+    return data[np.abs(modified_z_scores) <= threshold]
 
 speed_iqr = remove_outliers_iqr(speed)
 speed_zscore = remove_outliers_zscore(speed)
@@ -150,14 +214,42 @@ speed_modified_zscore = remove_outliers_modified_zscore(speed)
 print("-----End Outlier Detection-----\n\n")
 
 print("-----Start Visualizing-----")
+
+
+def normal_pdf(x, mean, std):
+    """
+    Evaluate the normal distribution density with NumPy.
+    :param x: values to evaluate
+    :param mean: mean of the distribution
+    :param std: standard deviation of the distribution
+    :return: density at the values
+    """
+    inv_std = 1.0 / std
+    return np.exp(-0.5 * ((x - mean) * inv_std) ** 2) * (inv_std * 0.3989422804014327)  # 1 / sqrt(2π)
+
+
 # Set up Seaborn style
 sns.set(style="whitegrid")
 
 # Create a figure with subplots
 fig, axs = plt.subplots(3, 2, figsize=(16, 18))
 
+# Histogram of speed shared by the frequency plots
+hist_counts, hist_edges = np.histogram(speed, bins=5)
+hist_widths = np.diff(hist_edges)
+hist_left_edges = hist_edges[:-1]
+
+
+def plot_speed_histogram(ax):
+    """
+    Draw the precomputed speed histogram on the axes.
+    :param ax: matplotlib axes
+    """
+    ax.bar(hist_left_edges, hist_counts, width=hist_widths, align='edge', edgecolor='black', alpha=0.7, color='skyblue')
+
+
 # Plot 1: Annotations for Central Tendency
-axs[0, 0].hist(speed, bins=5, edgecolor='black', alpha=0.7, color='skyblue')
+plot_speed_histogram(axs[0, 0])
 axs[0, 0].axvline(x=mean, color='red', linestyle='--', linewidth=2, label=f'Mean: {mean:.2f}')
 axs[0, 0].axvline(x=median, color='green', linestyle='--', linewidth=2, label=f'Median: {median}')
 axs[0, 0].axvline(x=mode, color='purple', linestyle='--', linewidth=2, label=f'Mode: {mode}')
@@ -178,7 +270,7 @@ axs[0, 1].set_xlabel('Speed')
 axs[0, 1].legend()
 
 # Plot 3: Annotations for MAD and Variance
-axs[1, 0].hist(speed, bins=5, edgecolor='black', alpha=0.7, color='skyblue')
+plot_speed_histogram(axs[1, 0])
 axs[1, 0].axvline(x=mean + mad_mean, color='red', linestyle='--', linewidth=2,
                   label=f'Mean + MAD(mean): {mean + mad_mean:.2f}')
 axs[1, 0].axvline(x=mean - mad_mean, color='red', linestyle='--', linewidth=2,
@@ -193,7 +285,7 @@ axs[1, 0].set_ylabel('Frequency')
 axs[1, 0].legend()
 
 # Plot 4: Annotations for Data Modeling
-axs[1, 1].hist(speed, bins=5, edgecolor='black', alpha=0.7, color='skyblue')
+plot_speed_histogram(axs[1, 1])
 axs[1, 1].annotate(f'Percentile of 86: {percentile_86:.2f}%', xy=(86, 2), xytext=(100, 5),
                    arrowprops=dict(facecolor='black', arrowstyle='->'), fontsize=10)
 axs[1, 1].annotate(f'Ordinal Rank of 86: {ordinal_rank_86}', xy=(86, 3), xytext=(100, 6),
@@ -207,10 +299,12 @@ axs[1, 1].set_xlabel('Speed')
 axs[1, 1].set_ylabel('Frequency')
 
 # Plot 5: Bell Curve with Standard Deviation and Empirical Rules
-sns.histplot(speed, kde=True, stat='density', linewidth=0, color='skyblue', ax=axs[2, 0])
+# KDE curves are evaluated on the same grid as the normal overlay instead of letting seaborn fit its own
+sns.histplot(speed, stat='density', linewidth=0, color='skyblue', ax=axs[2, 0])
 xmin, xmax = axs[2, 0].get_xlim()
 x = np.linspace(xmin, xmax, 100)
-pdf = st.norm.pdf(x, mean, std)
+axs[2, 0].plot(x, st.gaussian_kde(speed)(x), color='skyblue')
+pdf = normal_pdf(x, mean, std)
 axs[2, 0].plot(x, pdf, linewidth=2, color='red', label='Normal Distribution')
 axs[2, 0].axvline(mean, color='k', linestyle='--', linewidth=1, label='Mean')
 axs[2, 0].axvline(mean + std, color='blue', linestyle='--', linewidth=1, label='Mean + Std')
@@ -225,10 +319,12 @@ axs[2, 0].set_ylabel('Density')
 axs[2, 0].legend()
 
 # Plot 6: Bell Curve After Outlier Removal using Modified Z-score
-sns.histplot(speed_modified_zscore, kde=True, stat='density', linewidth=0, color='skyblue', ax=axs[2, 1])
+sns.histplot(speed_modified_zscore, stat='density', linewidth=0, color='skyblue', ax=axs[2, 1])
 xmin, xmax = axs[2, 1].get_xlim()
 x = np.linspace(xmin, xmax, 100)
-pdf = st.norm.pdf(x, np.mean(speed_modified_zscore), np.std(speed_modified_zscore))
+axs[2, 1].plot(x, st.gaussian_kde(speed_modified_zscore)(x), color='skyblue')
+cleaned_mean, cleaned_variance, _, _ = central_moments(speed_modified_zscore)
+pdf = normal_pdf(x, cleaned_mean, np.sqrt(cleaned_variance))
 axs[2, 1].plot(x, pdf, linewidth=2, color='red', label='Normal Distribution')
 axs[2, 1].set_title('Bell Curve After Outlier Removal')
 axs[2, 1].set_xlabel('Speed')
@@ -237,5 +333,8 @@ axs[2, 1].legend()
 
 # Adjust layout and display plot
 plt.subplots_adjust(hspace=0.5, wspace=0.3)  # Adjust spacing between subplots
-plt.show()
+if headless:
+    plt.savefig('descriptive_analysis.png', dpi=100)
+else:
+    plt.show()
 print("-----End Visualizing-----")
@@ -1,22 +1,83 @@
-import scipy.stats as stats
+import numpy as np
+from scipy import special
+from functools import lru_cache, partial
+from statistics import NormalDist
 import math
 
 
 def validate_estimation_inputs(p, n):
     """
     Check the condition if it meets the constraints
-    :param p: Proportion
-    :param n: Sample size
+    :param p: Proportion (float or array)
+    :param n: Sample size (int or array)
     :return: Tuple of boolean and string message
     """
     success = n * p
     fail = n * (1 - p)
+    if isinstance(success, np.ndarray):  # Arrays of groups are valid only if the smallest counts are
+        success, fail = success.min(), fail.min()
     if success < 10 or fail < 10:
         return False, "For proportion estimation, success and fail must both be at least 10."
 
     return True, "Inputs are valid."
 
 
+@lru_cache(maxsize=128)
+def z_critical_value(cl):
+    """
+    Two-sided critical value of the standard normal distribution.
+    :param cl: Confidence level (float), e.g., 0.95 for 95% confidence
+    :return: Z critical value (float)
+    """
+    alpha = (1 - cl) / 2  # Significance level
+    return NormalDist().inv_cdf(1 - alpha)
+
+
+@lru_cache(maxsize=1024)
+def t_critical_value(cl, df):
+    """
+    Two-sided critical value of the T distribution.
+    :param cl: Confidence level (float), e.g., 0.95 for 95% confidence
+    :param df: Degree of freedom (int)
+    :return: T critical value (float)
+    """
+    alpha = (1 - cl) / 2  # Significance level
+    return special.stdtrit(df, 1 - alpha)
+
+
+def standard_normal_cdf(z):
+    """
+    Standard normal CDF of a scalar using the C math library.
+    :param z: Z score (float)
+    :return: Cumulative probability (float)
+    """
+    return 0.5 * math.erfc(-z / math.sqrt(2))
+
+
+def interval_and_probability(mean, SE, critical, cdf, start, end):
+    """
+    Build the margin of error, confidence interval and range probability from a critical value.
+    :param mean: Sample mean or proportion (float)
+    :param SE: Standard Error (float)
+    :param critical: Critical value of the distribution (float)
+    :param cdf: CDF of the standardized distribution (function of a score)
+    :param start: Start of the range for probability calculation (float or None)
+    :param end: End of the range for probability calculation (float or None)
+    :return: Tuple containing:
+        - Margin of Error (float)
+        - Confidence Interval (tuple of two floats)
+        - Probability of the value falling within the specified range (float or None)
+    """
+    MoE = critical * SE  # Margin of Error
+    CI = (mean - MoE, mean + MoE)  # Confidence Interval
+
+    probability = None
+    if start is not None and end is not None:
+        probability = cdf((end - mean) / SE) - cdf((start - mean) / SE)
+
+    return MoE, CI, probability
+
+
 def z_distribution(mean, SE, cl, range_start, range_end):
     """
     Estimate using Z Distribution.
@@ -30,21 +91,7 @@ def z_distribution(mean, SE, cl, range_start, range_end):
         - Confidence Interval (tuple of two floats)
         - Probability of the value falling within the specified range (float or None)
     """
-    alpha = (1 - cl) / 2  # Significance level
-    z_critical = stats.norm.ppf(1 - alpha)
-    MoE = z_critical * SE  # Margin of Error
-    CI = (mean - MoE, mean + MoE)  # Confidence Interval
-
-    probability = None
-    if range_start is not None and range_end is not None:
-        ''' If you want to calculate z score from a normal distribution
-        z_start = (range_start - proportion) / std_error
-        z_end = (range_end - proportion) / std_error
-        probability_within_range = stats.norm.cdf(z_end) - stats.norm.cdf(z_start)'''
-        dist = stats.norm(mean, SE)
-        probability = dist.cdf(range_end) - dist.cdf(range_start)
-
-    return MoE, CI, probability
+    return interval_and_probability(mean, SE, z_critical_value(cl), standard_normal_cdf, range_start, range_end)
 
 
 def t_distribution(mean, SE, cl, n, start, end):
@@ -62,19 +109,7 @@ def t_distribution(mean, SE, cl, n, start, end):
         - Probability of the value falling within the specified range (float or None)
     """
     df = n - 1  # Degree of Freedom
-    dist = stats.t(df)
-    alpha = (1 - cl) / 2  # Significance level
-    t_critical = stats.t.ppf(1 - alpha, df)
-    MoE = t_critical * SE  # Margin of Error
-    CI = (mean - MoE, mean + MoE)  # Confidence Interval
-
-    probability = None
-    if start is not None and end is not None:
-        t_start = (start - mean) / SE
-        t_end = (end - mean) / SE
-        probability = dist.cdf(t_end) - dist.cdf(t_start)
-
-    return MoE, CI, probability
+    return interval_and_probability(mean, SE, t_critical_value(cl, df), partial(special.stdtr, df), start, end)
 
 
 def calculate_mean_estimation(mean, n, std, is_sample_std=1, cl=0.95, start=None, end=None):
@@ -100,6 +135,30 @@ def calculate_mean_estimation(mean, n, std, is_sample_std=1, cl=0.95, start=None
         return z_distribution(mean, SE, cl, start, end)   # when sample size >= 30 or σ is known.
 
 
+def make_mean_estimator(n, is_sample_std=1, cl=0.95):
+    """
+    Build a mean estimator specialized for a fixed sample size and confidence level.
+    :param n: Sample size (int)
+    :param is_sample_std: 1 for std and 0 for population std (bool)
+    :param cl: Confidence level (float), e.g., 0.95 for 95% confidence
+    :return: Function of (mean, std, start=None, end=None) returning the same tuple as calculate_mean_estimation
+    """
+    se_coeff = 1 / math.sqrt(n)
+    df = n - 1  # Degree of Freedom
+    use_t = n < 30 or is_sample_std
+    if use_t:
+        critical = t_critical_value(cl, df)
+        cdf = partial(special.stdtr, df)  # CDF of the T distribution with df degrees of freedom
+    else:
+        critical = z_critical_value(cl)
+        cdf = standard_normal_cdf
+
+    def estimate(mean, std, start=None, end=None):
+        return interval_and_probability(mean, std * se_coeff, critical, cdf, start, end)
+
+    return estimate
+
+
 def calculate_proportion_estimation(p, n, cl=0.95, start=None, end=None):
     """
     Estimate population parameters using proportion.
@@ -123,44 +182,124 @@ def calculate_proportion_estimation(p, n, cl=0.95, start=None, end=None):
     return z_distribution(p, SE, cl, start, end)
 
 
-# Example usage for mean estimation
-sample_mean = 2.29
-sample_std = .20
-sample_size = 12
-confidence_interval = 0.90
-start = 2.1
-end = 2.25
-
-MoE, CI, probability = calculate_mean_estimation(sample_mean, sample_size, sample_std, 1, confidence_interval, start, end)
-print(f"Mean Estimation - Margin of Error: {MoE:.2f}")
-print(f"Mean Estimation - Confidence Interval: ({CI[0]:.2f}, {CI[1]:.2f})")
-print(f"Mean Estimation - Probability within range [{start}, {end}]: {probability:.4f}")
-print("\n")
-
-sample_mean = 299720
-population_std = 68650
-sample_size = 1500
-confidence_interval = 0.95
-start = 290000
-end = 300000
-
-MoE, CI, probability = calculate_mean_estimation(sample_mean, sample_size, population_std, 0, confidence_interval, start, end)
-print(f"Mean Estimation - Margin of Error: {MoE:.2f}")
-print(f"Mean Estimation - Confidence Interval: ({CI[0]:.2f}, {CI[1]:.2f})")
-print(f"Mean Estimation - Probability within range [{start}, {end}]: {probability:.4f}")
-
-
-# Proportion estimation
-sample_proportion = 0.44
-sample_size = 1000
-confidence_interval = 0.95
-start = 0.45
-end = 0.47
-
-try:
-    MoE, CI, probability = calculate_proportion_estimation(sample_proportion, sample_size, confidence_interval, start, end)
-    print(f"Proportion Estimation - Margin of Error: {MoE:.4f}")
-    print(f"Proportion Estimation - Confidence Interval: ({CI[0]:.4f}, {CI[1]:.4f})")
-    print(f"Proportion Estimation - Probability within range [{start}, {end}]: {probability:.4f}")
-except ValueError as e:
-    print(f"Validation Error: {e}")
+def calculate_mean_estimation_batch(means, ns, stds, is_sample_std=1, cl=0.95, start=None, end=None):
+    """
+    Estimate population parameters for many groups at once using the mean and standard deviation.
+    :param means: Sample means (array of floats)
+    :param ns: Sample sizes (array of ints)
+    :param stds: Standard deviations (array of floats)
+    :param is_sample_std: 1 for std and 0 for population std (bool)
+    :param cl: Confidence level (float), e.g., 0.95 for 95% confidence
+    :param start: Start of the range for probability calculation (float, array or None)
+    :param end: End of the range for probability calculation (float, array or None)
+    :return: Tuple containing:
+        - Margin of Error (array of floats)
+        - Confidence Interval (tuple of two arrays)
+        - Probability of the value falling within the specified range (array of floats or None)
+    """
+    means, ns, stds = np.broadcast_arrays(np.asarray(means, dtype=float), np.asarray(ns), np.asarray(stds, dtype=float))
+    SE = stds / np.sqrt(ns)  # Standard error
+    df = ns - 1  # Degree of Freedom
+    use_t = (ns < 30) | bool(is_sample_std)
+    alpha = (1 - cl) / 2  # Significance level
+
+    critical = np.where(use_t, special.stdtrit(df, 1 - alpha), z_critical_value(cl))
+    MoE = critical * SE  # Margin of Error
+    CI = (means - MoE, means + MoE)  # Confidence Interval
+
+    probability = None
+    if start is not None and end is not None:
+        score_start = (start - means) / SE
+        score_end = (end - means) / SE
+        probability = np.where(use_t,
+                               special.stdtr(df, score_end) - special.stdtr(df, score_start),
+                               special.ndtr(score_end) - special.ndtr(score_start))
+
+    return MoE, CI, probability
+
+
+def calculate_proportion_estimation_batch(ps, ns, cl=0.95, start=None, end=None):
+    """
+    Estimate population parameters for many groups at once using proportion.
+    :param ps: Sample proportions (array of floats), where 0 <= p <= 1
+    :param ns: Sample sizes (array of ints)
+    :param cl: Confidence level (float), e.g., 0.95 for 95% confidence
+    :param start: Start of the range for probability calculation (float, array or None)
+    :param end: End of the range for probability calculation (float, array or None)
+    :return: Tuple containing:
+        - Margin of Error (array of floats)
+        - Confidence Interval (tuple of two arrays)
+        - Probability of the proportion falling within the specified range (array of floats or None)
+    """
+    ps, ns = np.broadcast_arrays(np.asarray(ps, dtype=float), np.asarray(ns))
+
+    # Validate inputs
+    is_valid, validation_message = validate_estimation_inputs(ps, ns)
+    if not is_valid:
+        raise ValueError(validation_message)
+
+    SE = np.sqrt((ps * (1 - ps)) / ns)
+
+    return interval_and_probability(ps, SE, z_critical_value(cl), special.ndtr, start, end)
+
+
+if __name__ == "__main__":
+    # Example usage for mean estimation
+    sample_mean = 2.29
+    sample_std = .20
+    sample_size = 12
+    confidence_interval = 0.90
+    start = 2.1
+    end = 2.25
+
+    MoE, CI, probability = calculate_mean_estimation(sample_mean, sample_size, sample_std, 1, confidence_interval, start, end)
+    print(f"Mean Estimation - Margin of Error: {MoE:.2f}")
+    print(f"Mean Estimation - Confidence Interval: ({CI[0]:.2f}, {CI[1]:.2f})")
+    print(f"Mean Estimation - Probability within range [{start}, {end}]: {probability:.4f}")
+    print("\n")
+
+    sample_mean = 299720
+    population_std = 68650
+    sample_size = 1500
+    confidence_interval = 0.95
+    start = 290000
+    end = 300000
+
+    MoE, CI, probability = calculate_mean_estimation(sample_mean, sample_size, population_std, 0, confidence_interval, start, end)
+    print(f"Mean Estimation - Margin of Error: {MoE:.2f}")
+    print(f"Mean Estimation - Confidence Interval: ({CI[0]:.2f}, {CI[1]:.2f})")
+    print(f"Mean Estimation - Probability within range [{start}, {end}]: {probability:.4f}")
+    print("\n")
+
+    # Estimator specialized once for the sample size and confidence level
+    estimate_mean = make_mean_estimator(sample_size, 0, confidence_interval)
+    MoE, CI, probability = estimate_mean(sample_mean, population_std, start, end)
+    print(f"Specialized Mean Estimation - Margin of Error: {MoE:.2f}")
+    print(f"Specialized Mean Estimation - Confidence Interval: ({CI[0]:.2f}, {CI[1]:.2f})")
+    print("\n")
+
+    # Proportion estimation
+    sample_proportion = 0.44
+    sample_size = 1000
+    confidence_interval = 0.95
+    start = 0.45
+    end = 0.47
+
+    try:
+        MoE, CI, probability = calculate_proportion_estimation(sample_proportion, sample_size, confidence_interval, start, end)
+        print(f"Proportion Estimation - Margin of Error: {MoE:.4f}")
+        print(f"Proportion Estimation - Confidence Interval: ({CI[0]:.4f}, {CI[1]:.4f})")
+        print(f"Proportion Estimation - Probability within range [{start}, {end}]: {probability:.4f}")
+    except ValueError as e:
+        print(f"Validation Error: {e}")
+    print("\n")
+
+    # Batch estimation for several groups
+    group_means = [2.29, 2.35, 2.18]
+    group_sizes = [12, 40, 25]
+    group_stds = [.20, .25, .18]
+
+    MoE, CI, probability = calculate_mean_estimation_batch(group_means, group_sizes, group_stds, 1, 0.90, 2.1, 2.25)
+    for i in range(len(group_means)):
+        print(f"Group {i + 1} Mean Estimation - Margin of Error: {MoE[i]:.2f}, "
+              f"Confidence Interval: ({CI[0][i]:.2f}, {CI[1][i]:.2f}), Probability: {probability[i]:.4f}")
@@ -1,5 +1,13 @@
 import numpy as np
-from scipy import stats
+from scipy.special import ndtr, ndtri
+from functools import lru_cache
+
+try:
+    from numba import njit, prange
+except ImportError:  # Fall back to plain Python when numba is not installed
+    def njit(*args, **kwargs):
+        return lambda func: func
+    prange = range
 
 '''
 P(Reject H₀ | H₀ is true) = α
@@ -16,78 +24,175 @@ In practice, you want the power to be at least 0.80, meaning there’s an 80% ch
 3. Reduce variability (if possible).
 '''
 
-def calculate_errors_power(mean_null, mean_alt, std, n, alpha=0.05, tails="two"):
+
+def z_quantile(alpha, tails):
+    """
+    Z critical value for the significance level and tail type.
+    :param alpha: Significance level (float or array)
+    :param tails: 'two' for two-tailed test, 'left' for left-tailed, 'right' for right-tailed
+    :return: Z critical value (float or array)
+    """
+    if tails == "two":
+        return ndtri(1 - alpha / 2)
+    elif tails == "right":
+        return ndtri(1 - alpha)
+    elif tails == "left":
+        return ndtri(alpha)
+    else:
+        raise ValueError("Invalid tail type. Choose 'two', 'left', or 'right'.")
+
+
+@lru_cache(maxsize=64)
+def cached_z_quantile(alpha, tails):
+    """
+    Memoized z_quantile, alpha must be a hashable scalar.
+    :param alpha: Significance level (float)
+    :param tails: 'two' for two-tailed test, 'left' for left-tailed, 'right' for right-tailed
+    :return: Z critical value (float)
+    """
+    return z_quantile(alpha, tails)
+
+
+# Z critical values for the usual 5% significance level, evaluated once at import
+Z_CRITICAL_ALPHA_05 = {
+    "two": ndtri(0.975),
+    "right": ndtri(0.95),
+    "left": ndtri(0.05),
+}
+
+
+def z_critical_value(alpha, tails):
+    """
+    Z critical value, cached for scalar significance levels and computed directly for arrays.
+    :param alpha: Significance level (float or array)
+    :param tails: 'two' for two-tailed test, 'left' for left-tailed, 'right' for right-tailed
+    :return: Z critical value (float or array)
+    """
+    if np.ndim(alpha) == 0:
+        if alpha == 0.05 and tails in Z_CRITICAL_ALPHA_05:
+            return Z_CRITICAL_ALPHA_05[tails]
+        return cached_z_quantile(float(alpha), tails)
+    return z_quantile(alpha, tails)
+
+
+def normal_interval_probability(z_low, z_high):
+    """
+    Probability of a standard normal value falling between two standardized bounds.
+    When both bounds are in the right tail the upper-tail form is used to avoid cancellation.
+    :param z_low: Standardized lower bound (float or array)
+    :param z_high: Standardized upper bound (float or array)
+    :return: Probability (float or array)
+    """
+    return np.where(z_low > 0, ndtr(-z_low) - ndtr(-z_high), ndtr(z_high) - ndtr(z_low))[()]  # [()] unwraps scalar results
+
+
+def two_tailed_beta(null, alt, z_critical, SE_null, SE_alt):
+    """
+    Type II error of a two-tailed test, H₀ is kept between the two critical values.
+    :param null: Mean or proportion under the null hypothesis
+    :param alt: Mean or proportion under the alternative hypothesis
+    :param z_critical: Z critical value for the upper tail
+    :param SE_null: Standard error under the null hypothesis
+    :param SE_alt: Standard error under the alternative hypothesis
+    :return: Type II error (beta)
+    """
+    critical_value_low = null - z_critical * SE_null
+    critical_value_high = null + z_critical * SE_null
+    return normal_interval_probability((critical_value_low - alt) / SE_alt, (critical_value_high - alt) / SE_alt)
+
+
+def right_tailed_beta(null, alt, z_critical, SE_null, SE_alt):
+    """
+    Type II error of a right-tailed test, there is no lower critical value.
+    :param null: Mean or proportion under the null hypothesis
+    :param alt: Mean or proportion under the alternative hypothesis
+    :param z_critical: Z critical value for the upper tail
+    :param SE_null: Standard error under the null hypothesis
+    :param SE_alt: Standard error under the alternative hypothesis
+    :return: Type II error (beta)
+    """
+    critical_value_high = null + z_critical * SE_null
+    return ndtr((critical_value_high - alt) / SE_alt)
+
+
+def left_tailed_beta(null, alt, z_critical, SE_null, SE_alt):
+    """
+    Type II error of a left-tailed test, there is no upper critical value.
+    :param null: Mean or proportion under the null hypothesis
+    :param alt: Mean or proportion under the alternative hypothesis
+    :param z_critical: Z critical value for the lower tail
+    :param SE_null: Standard error under the null hypothesis
+    :param SE_alt: Standard error under the alternative hypothesis
+    :return: Type II error (beta)
+    """
+    critical_value_low = null + z_critical * SE_null
+    return ndtr((alt - critical_value_low) / SE_alt)
+
+
+BETA_BY_TAILS = {
+    "two": two_tailed_beta,
+    "right": right_tailed_beta,
+    "left": left_tailed_beta,
+}
+
+
+def calculate_errors_power(mean_null, mean_alt, std, n, alpha=0.05, tails="two", dtype=np.float64):
     """
     Calculate Type I error, Type II error, and power of a hypothesis test for mean.
+    The numeric parameters may be arrays, which are broadcast together, e.g. to compute a power curve over sample sizes.
     :param mean_null: Mean under the null hypothesis
     :param mean_alt: Mean under the alternative hypothesis
     :param std: Standard deviation (assumed to be known)
     :param n: Sample size
     :param alpha: Significance level (Type I error probability)
     :param tails: 'two' for two-tailed test, 'left' for left-tailed, 'right' for right-tailed
-    :return: Type I error (alpha), Type II error (beta), and power of the test
+    :param dtype: Floating point type of the computation, np.float32 halves the memory of large sweeps
+    :return: Type I error (alpha), Type II error (beta), and power of the test (floats, or arrays for array inputs)
     """
+    # Z critical for alpha (type I error), looked up in double precision before casting
+    z_critical = np.asarray(z_critical_value(np.asarray(alpha, dtype=float), tails), dtype=dtype)
+
+    mean_null, mean_alt, std, n, alpha = (np.asarray(v, dtype=dtype) for v in (mean_null, mean_alt, std, n, alpha))
+
     # Calculate the standard error
     SE = std / np.sqrt(n)
 
-    # Z critical for alpha (type I error)
-    if tails == "two":
-        z_critical = stats.norm.ppf(1 - alpha / 2)
-        critical_value_low = mean_null - z_critical * SE
-        critical_value_high = mean_null + z_critical * SE
-    elif tails == "right":
-        z_critical = stats.norm.ppf(1 - alpha)
-        critical_value_low = -np.inf  # No lower critical value for right-tailed test
-        critical_value_high = mean_null + z_critical * SE
-    elif tails == "left":
-        z_critical = stats.norm.ppf(alpha)
-        critical_value_low = mean_null + z_critical * SE
-        critical_value_high = np.inf  # No upper critical value for left-tailed test
-
     # Type I Error is just alpha (pre-determined)
     type1_error = alpha
 
     # Type II Error (probability of failing to reject H0 when H0 is false)
-    if tails == "two":
-        beta = stats.norm.cdf(critical_value_high, loc=mean_alt, scale=SE) - stats.norm.cdf(critical_value_low, loc=mean_alt, scale=SE)
-    elif tails == "right":
-        beta = stats.norm.cdf(critical_value_high, loc=mean_alt, scale=SE)
-    elif tails == "left":
-        beta = 1 - stats.norm.cdf(critical_value_low, loc=mean_alt, scale=SE)
+    beta = BETA_BY_TAILS[tails](mean_null, mean_alt, z_critical, SE, SE)
 
     # Power of the test (1 - β)
     power = 1 - beta
 
+    # Scalar inputs give plain floats, as before array support
+    if np.ndim(power) == 0:
+        return float(type1_error), float(beta), float(power)
+
     return type1_error, beta, power
 
 
-def calculate_proportion_errors_power(p_null, p_alt, n, alpha=0.05, tails="two"):
+def calculate_proportion_errors_power(p_null, p_alt, n, alpha=0.05, tails="two", dtype=np.float64):
     """
     Calculate Type I error, Type II error, and power of a hypothesis test for proportion.
+    The numeric parameters may be arrays, which are broadcast together.
     :param p_null: Proportion under the null hypothesis
     :param p_alt: Proportion under the alternative hypothesis
     :param n: Sample size
     :param alpha: Significance level (Type I error probability)
     :param tails: 'two' for two-tailed test, 'left' for left-tailed, 'right' for right-tailed
-    :return: Type I error (alpha), Type II error (beta), and power of the test
+    :param dtype: Floating point type of the computation, np.float32 halves the memory of large sweeps
+    :return: Type I error (alpha), Type II error (beta), and power of the test (floats, or arrays for array inputs)
     """
+    # Z critical for alpha (Type I error), looked up in double precision before casting
+    z_critical = np.asarray(z_critical_value(np.asarray(alpha, dtype=float), tails), dtype=dtype)
+
+    p_null, p_alt, n, alpha = (np.asarray(v, dtype=dtype) for v in (p_null, p_alt, n, alpha))
+
     # Calculate the standard error for proportion
     SE_null = np.sqrt((p_null * (1 - p_null)) / n)
 
-    # Z critical for alpha (Type I error)
-    if tails == "two":
-        z_critical = stats.norm.ppf(1 - alpha / 2)
-        critical_value_low = p_null - z_critical * SE_null
-        critical_value_high = p_null + z_critical * SE_null
-    elif tails == "right":
-        z_critical = stats.norm.ppf(1 - alpha)
-        critical_value_low = -np.inf
-        critical_value_high = p_null + z_critical * SE_null
-    elif tails == "left":
-        z_critical = stats.norm.ppf(alpha)
-        critical_value_low = p_null + z_critical * SE_null
-        critical_value_high = np.inf
-
     # Type I Error is just alpha (pre-determined)
     type1_error = alpha
 
@@ -95,39 +200,95 @@ def calculate_proportion_errors_power(p_null, p_alt, n, alpha=0.05, tails="two")
     SE_alt = np.sqrt((p_alt * (1 - p_alt)) / n)
 
     # Type II Error (probability of failing to reject H0 when H0 is false)
-    if tails == "two":
-        beta = stats.norm.cdf(critical_value_high, loc=p_alt, scale=SE_alt) - stats.norm.cdf(critical_value_low, loc=p_alt, scale=SE_alt)
-    elif tails == "right":
-        beta = stats.norm.cdf(critical_value_high, loc=p_alt, scale=SE_alt)
-    elif tails == "left":
-        beta = 1 - stats.norm.cdf(critical_value_low, loc=p_alt, scale=SE_alt)
+    beta = BETA_BY_TAILS[tails](p_null, p_alt, z_critical, SE_null, SE_alt)
 
     # Power of the test (1 - β)
     power = 1 - beta
 
+    # Scalar inputs give plain floats, as before array support
+    if np.ndim(power) == 0:
+        return float(type1_error), float(beta), float(power)
+
     return type1_error, beta, power
 
 
-# Example inputs for mean hypothesis testing
-mean_null = 15  # Null hypothesis mean
-mean_alt = 15.5  # Alternative hypothesis mean (close to the null mean)
-std = 0.5  # Standard deviation
-n_mean = 10  # Sample size for mean
-alpha = 0.05  # Significance level (Type I error)
-
-# Example inputs for proportion hypothesis testing
-p_null = 0.5  # Null hypothesis proportion
-p_alt = 0.65  # Alternative hypothesis proportion (slightly higher)
-n_proportion = 100  # Sample size for proportion
-
-# Perform the calculations for mean (adjust 'tails' as 'left', 'right', or 'two')
-type1_error_mean, beta_mean, power_mean = calculate_errors_power(mean_null, mean_alt, std, n_mean, alpha, tails="two")
-print(f"Mean Test - Type I Error (Alpha): {type1_error_mean:.4f}")
-print(f"Mean Test - Type II Error (Beta): {beta_mean:.4f}")
-print(f"Mean Test - Power of the Test: {power_mean:.4f}")
-
-# Perform the calculations for proportion (adjust 'tails' as 'left', 'right', or 'two')
-type1_error_proportion, beta_proportion, power_proportion = calculate_proportion_errors_power(p_null, p_alt, n_proportion, alpha, tails="two")
-print(f"Proportion Test - Type I Error (Alpha): {type1_error_proportion:.4f}")
-print(f"Proportion Test - Type II Error (Beta): {beta_proportion:.4f}")
-print(f"Proportion Test - Power of the Test: {power_proportion:.4f}")
+@njit(parallel=True, cache=True)
+def simulate_rejection_rate(mean_null, mean_alt, std, n, z_critical, tails, trials):
+    """
+    Draw samples under the alternative hypothesis and count how often the z-test rejects H₀.
+    :param mean_null: Mean under the null hypothesis
+    :param mean_alt: Mean under the alternative hypothesis
+    :param std: Standard deviation (assumed to be known)
+    :param n: Sample size
+    :param z_critical: Z critical value for the test
+    :param tails: 'two' for two-tailed test, 'left' for left-tailed, 'right' for right-tailed
+    :param trials: Number of simulated samples
+    :return: Proportion of trials where H₀ is rejected
+    """
+    SE = std / np.sqrt(n)
+    rejections = 0
+    for _ in prange(trials):
+        z_score = (np.random.normal(mean_alt, std, n).mean() - mean_null) / SE
+        if tails == "two":
+            reject = abs(z_score) > z_critical
+        elif tails == "right":
+            reject = z_score > z_critical
+        else:
+            reject = z_score < z_critical
+        rejections += 1 if reject else 0
+
+    return rejections / trials
+
+
+def simulate_power(mean_null, mean_alt, std, n, alpha=0.05, tails="two", trials=100000):
+    """
+    Estimate the power of a hypothesis test for mean by Monte Carlo simulation.
+    :param mean_null: Mean under the null hypothesis
+    :param mean_alt: Mean under the alternative hypothesis
+    :param std: Standard deviation (assumed to be known)
+    :param n: Sample size
+    :param alpha: Significance level (Type I error probability)
+    :param tails: 'two' for two-tailed test, 'left' for left-tailed, 'right' for right-tailed
+    :param trials: Number of simulated samples
+    :return: Simulated power of the test
+    """
+    z_critical = float(z_critical_value(alpha, tails))
+    return simulate_rejection_rate(float(mean_null), float(mean_alt), float(std), int(n), z_critical, tails, int(trials))
+
+
+if __name__ == "__main__":
+    # Example inputs for mean hypothesis testing
+    mean_null = 15  # Null hypothesis mean
+    mean_alt = 15.5  # Alternative hypothesis mean (close to the null mean)
+    std = 0.5  # Standard deviation
+    n_mean = 10  # Sample size for mean
+    alpha = 0.05  # Significance level (Type I error)
+
+    # Example inputs for proportion hypothesis testing
+    p_null = 0.5  # Null hypothesis proportion
+    p_alt = 0.65  # Alternative hypothesis proportion (slightly higher)
+    n_proportion = 100  # Sample size for proportion
+
+    # Perform the calculations for mean (adjust 'tails' as 'left', 'right', or 'two')
+    type1_error_mean, beta_mean, power_mean = calculate_errors_power(mean_null, mean_alt, std, n_mean, alpha, tails="two")
+    print(f"Mean Test - Type I Error (Alpha): {type1_error_mean:.4f}")
+    print(f"Mean Test - Type II Error (Beta): {beta_mean:.4f}")
+    print(f"Mean Test - Power of the Test: {power_mean:.4f}")
+    print(f"Mean Test - Simulated Power of the Test: {simulate_power(mean_null, mean_alt, std, n_mean, alpha, tails='two'):.4f}")
+
+    # Perform the calculations for proportion (adjust 'tails' as 'left', 'right', or 'two')
+    type1_error_proportion, beta_proportion, power_proportion = calculate_proportion_errors_power(p_null, p_alt, n_proportion, alpha, tails="two")
+    print(f"Proportion Test - Type I Error (Alpha): {type1_error_proportion:.4f}")
+    print(f"Proportion Test - Type II Error (Beta): {beta_proportion:.4f}")
+    print(f"Proportion Test - Power of the Test: {power_proportion:.4f}")
+
+    # Power curve for the mean test over a range of sample sizes
+    sample_sizes = np.arange(2, 21)
+    _, _, power_curve = calculate_errors_power(mean_null, mean_alt, std, sample_sizes, alpha, tails="two")
+    min_n = sample_sizes[np.argmax(power_curve >= 0.80)]
+    print(f"Mean Test - Smallest sample size with power >= 0.80: {min_n}")
+
+    # Power grid over sample size and alternative mean in single precision
+    alt_means = np.linspace(15.1, 16, 10)[:, np.newaxis]
+    _, _, power_grid = calculate_errors_power(mean_null, alt_means, std, sample_sizes, alpha, tails="two", dtype=np.float32)
+    print(f"Mean Test - Power grid shape: {power_grid.shape}, dtype: {power_grid.dtype}")
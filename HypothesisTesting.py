@@ -1,15 +1,29 @@
+import numpy as np
 import scipy.stats as stats
+from scipy.special import log_ndtr, ndtr, stdtr
 import math
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Fall back to plain Python when numba is not installed
+    def njit(*args, **kwargs):
+        return lambda func: func
+    NUMBA_AVAILABLE = False
+
 
 def validate_proportion_inputs(p, n):
     """
     Validate inputs for proportion hypothesis testing.
-    :param p: Sample proportion (float)
-    :param n: Sample size (int)
+    :param p: Sample proportion (float or array)
+    :param n: Sample size (int or array)
     :return: Tuple of boolean and validation message
     """
-    if n * p < 10 or n * (1 - p) < 10:
+    succeeded = n * p
+    failed = n * (1 - p)
+    if isinstance(succeeded, np.ndarray):  # Arrays of tests are valid only if the smallest counts are
+        succeeded, failed = succeeded.min(), failed.min()
+    if succeeded < 10 or failed < 10:
         return False, "For proportion estimation, succeeded = np and failed = n(1-p) must both be at least 10."
     return True, "Inputs are valid."
 
@@ -56,29 +70,73 @@ def calculate_t_score(sample_mean, population_mean, se):
     return (sample_mean - population_mean) / se
 
 
-def calculate_p_value(z_score, tail_type='two', df=None):
+def normal_p_value(z_score, tail_type='two'):
+    """
+    Calculate the p-value for a Z-test from the complementary error function.
+    :param z_score: Z-score (float)
+    :param tail_type: Type of test ('two', 'left', 'right')
+    :return: p-value (float)
+    """
+    if tail_type == 'two':
+        return math.erfc(abs(z_score) / math.sqrt(2))
+    elif tail_type == 'left':
+        return 0.5 * math.erfc(-z_score / math.sqrt(2))
+    elif tail_type == 'right':
+        return 0.5 * math.erfc(z_score / math.sqrt(2))
+    else:
+        raise ValueError("Invalid tail type. Choose 'two', 'left', or 'right'.")
+
+
+# Compiled copy for use inside other kernels, Python callers use normal_p_value to skip the dispatch cost
+compiled_normal_p_value = njit(cache=True)(normal_p_value)
+
+
+def calculate_log_p_value(z_score, tail_type='two', df=None):
+    """
+    Calculate the natural logarithm of the p-value, which stays finite where the p-value underflows to zero.
+    :param z_score: Z-score or T-score (float)
+    :param tail_type: Type of test ('two', 'left', 'right')
+    :param df: Degrees of freedom (int), used for T-distribution
+    :return: log of the p-value (float)
+    """
+    if df is None:
+        log_cdf = log_ndtr
+    else:
+        def log_cdf(score):
+            return stats.t.logcdf(score, df)
+
+    if tail_type == 'two':
+        return math.log(2) + log_cdf(-abs(z_score))
+    elif tail_type == 'left':
+        return log_cdf(z_score)
+    elif tail_type == 'right':
+        return log_cdf(-z_score)
+    else:
+        raise ValueError("Invalid tail type. Choose 'two', 'left', or 'right'.")
+
+
+def calculate_p_value(z_score, tail_type='two', df=None, log_p=False):
     """
     Calculate the p-value for a hypothesis test.
     :param z_score: Z-score or T-score (float)
     :param tail_type: Type of test ('two', 'left', 'right')
     :param df: Degrees of freedom (int), used for T-distribution
+    :param log_p: Return the natural logarithm of the p-value (bool)
     :return: p-value (float)
     """
+    if log_p:
+        return calculate_log_p_value(z_score, tail_type, df)
+
+    if df is None:
+        return normal_p_value(z_score, tail_type)
+
+    # Upper tails are taken as the CDF of the negated score, which stays accurate where 1 - CDF cancels to zero
     if tail_type == 'two':
-        if df is None:
-            return 2 * (1 - stats.norm.cdf(abs(z_score)))
-        else:
-            return 2 * (1 - stats.t.cdf(abs(z_score), df))
+        return 2 * stdtr(df, -abs(z_score))
     elif tail_type == 'left':
-        if df is None:
-            return stats.norm.cdf(z_score)
-        else:
-            return stats.t.cdf(z_score, df)
+        return stdtr(df, z_score)
     elif tail_type == 'right':
-        if df is None:
-            return 1 - stats.norm.cdf(z_score)
-        else:
-            return 1 - stats.t.cdf(z_score, df)
+        return stdtr(df, -z_score)
     else:
         raise ValueError("Invalid tail type. Choose 'two', 'left', or 'right'.")
 
@@ -95,15 +153,14 @@ def hypothesis_test_mean(sample_mean, population_mean, std_dev, n, alpha, tail_t
     :param is_population_std: Whether the standard deviation is of the population (True) or sample (False)
     :return: Tuple containing the test statistic (Z or T), p-value, and decision
     """
-    se = calculate_standard_error_mean(std_dev, n)
+    se = std_dev / math.sqrt(n)  # Standard error of the mean
+    test_stat = (sample_mean - population_mean) / se  # Z-score and T-score share the same formula
 
     if n >= 30 or is_population_std:
         # Z-Test
-        test_stat = calculate_z_score(sample_mean, population_mean, se)
         p_value = calculate_p_value(test_stat, tail_type)
     else:
         # T-Test
-        test_stat = calculate_t_score(sample_mean, population_mean, se)
         df = n - 1  # Degrees of freedom for T-test
         p_value = calculate_p_value(test_stat, tail_type, df)
 
@@ -125,49 +182,141 @@ def hypothesis_test_proportion(sample_proportion, population_proportion, n, alph
     if not is_valid:
         raise ValueError(validation_message)
 
-    se = calculate_standard_error_proportion(population_proportion, n)
-    z_score = calculate_z_score(sample_proportion, population_proportion, se)
+    se = math.sqrt((population_proportion * (1 - population_proportion)) / n)  # Standard error of the proportion
+    z_score = (sample_proportion - population_proportion) / se
     p_value = calculate_p_value(z_score, tail_type)
     decision = "Reject H₀" if p_value < alpha else "Fail to Reject H₀"
 
     return z_score, p_value, decision
 
 
-# Example Usage
-# Z-Test or T-Test for Mean
-sample_mean = 17  # Sample mean height
-population_mean = 15  # Hypothesized population mean
-std_dev = 0.5  # Standard deviation (known population std)
-n = 10  # Sample size
-alpha = 0.05  # Significance level
-
-# Z-Test for Mean
-test_stat, p_value, decision = hypothesis_test_mean(sample_mean, population_mean, std_dev, n, alpha, 'right',
-                                                    is_population_std=True)
-print(f"Mean Test (Z-Test) - Test Statistic: {test_stat:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
-
-# T-Test for Mean
-test_stat, p_value, decision = hypothesis_test_mean(sample_mean, population_mean, std_dev, n, alpha, 'right',
-                                                    is_population_std=False)
-print(f"Mean Test (T-Test) - Test Statistic: {test_stat:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
-
-# Two-tailed Z-Test for Mean
-sample_mean = 350  # Sample mean height
-population_mean = 355  # Hypothesized population mean
-std_dev = 8  # Standard deviation (known population std)
-n = 30  # Sample size
-
-# Z-Test for Mean
-test_stat, p_value, decision = hypothesis_test_mean(sample_mean, population_mean, std_dev, n, alpha, 'two',
-                                                    is_population_std=True)
-
-print(f"Two tail Mean Test (Z-Test) - Test Statistic: {test_stat:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
-
-# Z-Test for Proportion
-sample_proportion = 0.44  # Sample proportion
-population_proportion = 0.5  # Hypothesized population proportion
-n = 1000  # Sample size
-alpha = 0.05  # Significance level
-
-z_score, p_value, decision = hypothesis_test_proportion(sample_proportion, population_proportion, n, alpha, 'two')
-print(f"Proportion Test - Z-score: {z_score:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
+def hypothesis_test_proportion_batch(sample_proportion, population_proportion, n, alpha, tail_type='two'):
+    """
+    Perform hypothesis tests for many proportions at once, e.g. a batch of A/B tests.
+    :param sample_proportion: Sample proportions (array of floats)
+    :param population_proportion: Hypothesized population proportions (float or array)
+    :param n: Sample sizes (int or array)
+    :param alpha: Significance level (float)
+    :param tail_type: Type of test ('two', 'left', 'right')
+    :return: Tuple containing arrays of z-scores, p-values, and whether H₀ is rejected
+    """
+    sample_proportion = np.asarray(sample_proportion, dtype=float)
+    population_proportion = np.asarray(population_proportion, dtype=float)
+    n = np.asarray(n)
+
+    is_valid, validation_message = validate_proportion_inputs(population_proportion, n)
+    if not is_valid:
+        raise ValueError(validation_message)
+
+    se = np.sqrt((population_proportion * (1 - population_proportion)) / n)
+    z_score = (sample_proportion - population_proportion) / se
+
+    if tail_type == 'two':
+        p_value = 2 * ndtr(-np.abs(z_score))
+    elif tail_type == 'left':
+        p_value = ndtr(z_score)
+    elif tail_type == 'right':
+        p_value = ndtr(-z_score)
+    else:
+        raise ValueError("Invalid tail type. Choose 'two', 'left', or 'right'.")
+
+    return z_score, p_value, p_value < alpha
+
+
+@njit(nogil=True, cache=True)
+def proportion_test_kernel(sample_proportions, population_proportion, n, alpha, tail_type):
+    """
+    Test each sample proportion against the same hypothesized proportion in one compiled loop.
+    :param sample_proportions: Sample proportions (contiguous float64 array)
+    :param population_proportion: Hypothesized population proportion (float)
+    :param n: Sample size (float)
+    :param alpha: Significance level (float)
+    :param tail_type: Type of test ('two', 'left', 'right')
+    :return: Tuple containing arrays of z-scores, p-values, and whether H₀ is rejected
+    """
+    size = sample_proportions.size
+    z_scores = np.empty(size)
+    p_values = np.empty(size)
+    rejected = np.empty(size, dtype=np.bool_)
+    se = math.sqrt((population_proportion * (1 - population_proportion)) / n)
+    for i in range(size):
+        z_scores[i] = (sample_proportions[i] - population_proportion) / se
+        p_values[i] = compiled_normal_p_value(z_scores[i], tail_type)
+        rejected[i] = p_values[i] < alpha
+
+    return z_scores, p_values, rejected
+
+
+def hypothesis_test_proportion_stream(sample_proportions, population_proportion, n, alpha, tail_type='two'):
+    """
+    Perform hypothesis tests for a long stream of sample proportions sharing the hypothesized proportion and sample size.
+    Runs in a numba compiled loop without the GIL, or as hypothesis_test_proportion_batch when numba is not installed.
+    :param sample_proportions: Sample proportions (array of floats)
+    :param population_proportion: Hypothesized population proportion (float)
+    :param n: Sample size (int)
+    :param alpha: Significance level (float)
+    :param tail_type: Type of test ('two', 'left', 'right')
+    :return: Tuple containing arrays of z-scores, p-values, and whether H₀ is rejected
+    """
+    if not NUMBA_AVAILABLE:
+        return hypothesis_test_proportion_batch(sample_proportions, population_proportion, n, alpha, tail_type)
+
+    is_valid, validation_message = validate_proportion_inputs(population_proportion, n)
+    if not is_valid:
+        raise ValueError(validation_message)
+
+    sample_proportions = np.ascontiguousarray(sample_proportions, dtype=np.float64)
+    return proportion_test_kernel(sample_proportions, float(population_proportion), float(n), float(alpha), tail_type)
+
+
+if __name__ == "__main__":
+    # Example Usage
+    # Z-Test or T-Test for Mean
+    sample_mean = 17  # Sample mean height
+    population_mean = 15  # Hypothesized population mean
+    std_dev = 0.5  # Standard deviation (known population std)
+    n = 10  # Sample size
+    alpha = 0.05  # Significance level
+
+    # Z-Test for Mean
+    test_stat, p_value, decision = hypothesis_test_mean(sample_mean, population_mean, std_dev, n, alpha, 'right',
+                                                        is_population_std=True)
+    print(f"Mean Test (Z-Test) - Test Statistic: {test_stat:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
+
+    # T-Test for Mean
+    test_stat, p_value, decision = hypothesis_test_mean(sample_mean, population_mean, std_dev, n, alpha, 'right',
+                                                        is_population_std=False)
+    print(f"Mean Test (T-Test) - Test Statistic: {test_stat:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
+
+    # Two-tailed Z-Test for Mean
+    sample_mean = 350  # Sample mean height
+    population_mean = 355  # Hypothesized population mean
+    std_dev = 8  # Standard deviation (known population std)
+    n = 30  # Sample size
+
+    # Z-Test for Mean
+    test_stat, p_value, decision = hypothesis_test_mean(sample_mean, population_mean, std_dev, n, alpha, 'two',
+                                                        is_population_std=True)
+
+    print(f"Two tail Mean Test (Z-Test) - Test Statistic: {test_stat:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
+
+    # Z-Test for Proportion
+    sample_proportion = 0.44  # Sample proportion
+    population_proportion = 0.5  # Hypothesized population proportion
+    n = 1000  # Sample size
+    alpha = 0.05  # Significance level
+
+    z_score, p_value, decision = hypothesis_test_proportion(sample_proportion, population_proportion, n, alpha, 'two')
+    print(f"Proportion Test - Z-score: {z_score:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
+
+    # Log p-value for an extreme test statistic where the p-value itself underflows
+    z_score = 40
+    print(f"Extreme Z-score {z_score} - p-value: {calculate_p_value(z_score)}, "
+          f"log p-value: {calculate_p_value(z_score, log_p=True):.2f}")
+
+    # Z-Test for a batch of proportions
+    sample_proportions = [0.44, 0.48, 0.53, 0.56]
+    z_scores, p_values, rejected = hypothesis_test_proportion_batch(sample_proportions, population_proportion, n, alpha, 'two')
+    for sample_proportion, z_score, p_value, reject in zip(sample_proportions, z_scores, p_values, rejected):
+        decision = "Reject H₀" if reject else "Fail to Reject H₀"
+        print(f"Batch Proportion Test ({sample_proportion}) - Z-score: {z_score:.2f}, p-value: {p_value:.4f}, Decision: {decision}")
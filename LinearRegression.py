@@ -1,48 +1,93 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import linregress
-
-# Example data
-x = np.array([1, 2, 3, 4, 5])
-y = np.array([2, 3, 5, 7, 11])
-
-# Perform linear regression
-slope, intercept, r_value, p_value, std_err = linregress(x, y)
-
-# Calculate Coefficient of determination(R^2)
-r_squared = r_value ** 2
-
-# Predict y values
-y_pred = slope * x + intercept
-
-# Calculate residuals (squared errors)
-residuals = y - y_pred
-
-mean_squared_error = np.mean(residuals ** 2)
-root_mean_squared_error = np.sqrt(mean_squared_error)
-
-# Plot using seaborn
-plt.figure(figsize=(8, 6))
-sns.scatterplot(x=x, y=y, color='blue', label='Data points')
-sns.lineplot(x=x, y=y_pred, color='black', label='Regression line')
-
-# Plot residuals as vertical and horizontal lines
-for i in range(len(x)):
-    plt.plot([x[i], x[i]], [y[i], y_pred[i]], color='red', linestyle='--', linewidth=1)
-    plt.plot([x[i], x[i]], [y_pred[i], y[i]], color='white', linestyle='--', linewidth=1)
-
-# Annotate with regression equation, R-value, R-squared, and mean squared error
-plt.text(2, 10, f'y = {slope:.2f}x {"+" if intercept >= 0 else "-"} {abs(intercept):.2f}', fontsize=12, color='black', ha='left')
-plt.text(2, 9.5, f'R (Correlation coefficient): {r_value:.2f}', fontsize=12, color='black', ha='left')
-plt.text(2, 9, f'R^2 (Coefficient of determination): {r_squared:.2f}', fontsize=12, color='black', ha='left')
-plt.text(2, 8.5, f'Mean Squared Error: {mean_squared_error:.2f}', fontsize=12, color='black', ha='left')
-plt.text(2, 8, f'Root Mean Squared Error: {root_mean_squared_error:.2f}', fontsize=12, color='black', ha='left')
-
-plt.xlabel('X')
-plt.ylabel('Y')
-plt.title('Linear Regression')
-plt.legend()
-plt.grid(False)  # Remove gridlines
-plt.tight_layout()  # Ensures tight layout to prevent overlap
-plt.show()
+
+
+def fit_line(x, y):
+    """
+    Fit a least squares regression line in closed form.
+    :param x: array of x values
+    :param y: array of y values
+    :return: Tuple of slope, intercept, correlation coefficient and mean squared error
+    """
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    dy = y - y_mean
+    sxx = dx @ dx
+    syy = dy @ dy
+    sxy = dx @ dy
+    slope = sxy / sxx
+    intercept = y_mean - slope * x_mean
+    r_value = sxy / np.sqrt(sxx * syy)
+
+    # Calculate residuals (squared errors)
+    residuals = dy - slope * dx  # y - (slope * x + intercept)
+    mean_squared_error = (residuals @ residuals) / residuals.size  # Sum of squares as one dot product
+
+    return slope, intercept, r_value, mean_squared_error
+
+
+def plot_regression(ax, x, y, slope, intercept, r_value, mean_squared_error):
+    """
+    Draw the data points, regression line, residuals and fit statistics on the axes.
+    The caller owns the figure, so the same axes can be cleared and reused for many datasets.
+    :param ax: matplotlib axes
+    :param x: array of x values
+    :param y: array of y values
+    :param slope: slope of the regression line
+    :param intercept: intercept of the regression line
+    :param r_value: correlation coefficient
+    :param mean_squared_error: mean squared error of the fit
+    """
+    # Plotting libraries are only needed when plotting
+    import seaborn as sns
+    from matplotlib.collections import LineCollection
+
+    # Calculate Coefficient of determination(R^2)
+    r_squared = r_value ** 2
+    root_mean_squared_error = np.sqrt(mean_squared_error)
+
+    # Predict y values
+    y_pred = slope * x + intercept
+
+    # Plot using seaborn
+    sns.scatterplot(x=x, y=y, color='blue', label='Data points', ax=ax)
+    sns.lineplot(x=x, y=y_pred, color='black', label='Regression line', ax=ax)
+
+    # Plot residuals as vertical lines, one segment from each point to the regression line
+    segments = np.stack([np.column_stack([x, y]), np.column_stack([x, y_pred])], axis=1)
+    ax.add_collection(LineCollection(segments, colors='red', linestyles='--', linewidths=1))
+
+    # Annotate with regression equation, R-value, R-squared, and mean squared error
+    # Positions are fractions of the axes, so the text stays in the top left corner for any dataset
+    annotations = [
+        f'y = {slope:.2f}x {"+" if intercept >= 0 else "-"} {abs(intercept):.2f}',
+        f'R (Correlation coefficient): {r_value:.2f}',
+        f'R^2 (Coefficient of determination): {r_squared:.2f}',
+        f'Mean Squared Error: {mean_squared_error:.2f}',
+        f'Root Mean Squared Error: {root_mean_squared_error:.2f}',
+    ]
+    for i, annotation in enumerate(annotations):
+        ax.text(0.03, 0.97 - 0.05 * i, annotation, transform=ax.transAxes, fontsize=12, color='black', ha='left', va='top')
+
+    ax.set_xlabel('X')
+    ax.set_ylabel('Y')
+    ax.set_title('Linear Regression')
+    ax.legend()
+    ax.grid(False)  # Remove gridlines
+
+
+if __name__ == "__main__":
+    # Plotting libraries are only needed when run as a script
+    import matplotlib.pyplot as plt
+
+    # Example data
+    x = np.array([1, 2, 3, 4, 5])
+    y = np.array([2, 3, 5, 7, 11])
+
+    # Perform linear regression (least squares in closed form)
+    slope, intercept, r_value, mean_squared_error = fit_line(x, y)
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    plot_regression(ax, x, y, slope, intercept, r_value, mean_squared_error)
+    fig.tight_layout()  # Ensures tight layout to prevent overlap
+    plt.show()
@@ -1,17 +1,101 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import norm
+import math
+import sys
+from scipy.special import ndtri
+
+try:
+    from numba import njit
+except ImportError:  # Fall back to plain Python when numba is not installed
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+plot = '--no-plot' not in sys.argv  # Only print the probabilities when the figure is not needed
 
 speed = np.array([99, 86, 87, 88, 111, 86, 103, 87, 94, 78, 77, 85, 86])
 
-# Create a normal distribution
-dist = norm(np.mean(speed), np.std(speed))
+# Parameters of the normal distribution
+mu = speed.mean()
+deviation = speed - mu  # Centered once, the variance is a single dot product
+sigma = math.sqrt((deviation @ deviation) / speed.size)
+
+
+def pdf(x):
+    """
+    Probability density function of the normal distribution.
+    :param x: value or array of values
+    :return: density at x
+    """
+    z = (x - mu) / sigma
+    return np.exp(-0.5 * z ** 2) / (sigma * np.sqrt(2 * np.pi))
+
+
+@njit(cache=True, fastmath=True)
+def pdf_grid(x, mu, sigma):
+    """
+    Probability density function of the normal distribution over an array in one fused loop.
+    :param x: array of values
+    :param mu: mean of the distribution
+    :param sigma: standard deviation of the distribution
+    :return: array of densities
+    """
+    out = np.empty_like(x)
+    norm_const = 1.0 / (sigma * math.sqrt(2 * math.pi))
+    exponent_coeff = -0.5 / (sigma * sigma)  # Folds the standardization into the exponent
+    for i in range(x.size):
+        deviation = x[i] - mu
+        out[i] = norm_const * math.exp(exponent_coeff * deviation * deviation)
+    return out
+
+
+def cdf(x):
+    """
+    Cumulative distribution function of the normal distribution for a scalar using the C math library.
+    :param x: value
+    :return: probability of being less than or equal to x
+    """
+    return 0.5 * math.erfc((mu - x) / (sigma * math.sqrt(2)))
+
+
+def ppf(q):
+    """
+    Percent point function (inverse of cdf) of the normal distribution.
+    :param q: probability or array of probabilities
+    :return: value at the probability
+    """
+    return mu + sigma * ndtri(q)
+
+
+def grid_region(x_values, pdf_values, low, high):
+    """
+    Part of the PDF curve between two bounds, the grid points inside are found by binary search.
+    The exact bounds are added at both ends, so adjacent regions meet without a gap at any grid resolution.
+    :param x_values: sorted array of grid values
+    :param pdf_values: PDF evaluated on the grid
+    :param low: lower bound of the region
+    :param high: upper bound of the region
+    :return: Tuple of x values and PDF values of the region
+    """
+    inside = slice(np.searchsorted(x_values, low, side='left'), np.searchsorted(x_values, high, side='right'))
+    pdf_low, pdf_high = pdf_grid(np.array([low, high], dtype=np.float64), mu, sigma)
+    return np.r_[low, x_values[inside], high], np.r_[pdf_low, pdf_values[inside], pdf_high]
+
+
+def fill_regions(ax, regions):
+    """
+    Shade the highlighted regions under the PDF and label them with their probabilities.
+    :param ax: matplotlib axes
+    :param regions: list of ((x values, PDF values), color, label, probability, text position)
+    """
+    for (x_region, pdf_region), color, label, probability, (text_x, text_y) in regions:
+        ax.fill_between(x_region, pdf_region, color=color, alpha=0.3, label=f'{label} = {probability:.2f}')
+        ax.text(text_x, text_y, f'{probability:.2f}', color=color, ha='center')
+
 
 print("-----Start calculating probability under points-----")
 # Calculate the CDF values at 86 and 99
-cdf_86 = dist.cdf(86)
-cdf_99 = dist.cdf(99)
+cdf_86 = cdf(86)
+cdf_99 = cdf(99)
+pdf_86, pdf_99 = pdf(np.array([86.0, 99.0]))
 
 # Calculate the probabilities
 prob_between_86_and_99 = cdf_99 - cdf_86
@@ -26,12 +110,12 @@ print("-----End calculating probability under points-----\n\n")
 print("-----Start calculating probability under percentiles-----")
 # ppf is the inverse of cdf: it takes a probability and returns the corresponding value
 # Find the values at the 34th and 84th percentiles
-point_of_34 = dist.ppf(0.34)
-point_of_84 = dist.ppf(0.84)
+point_of_34, point_of_84 = ppf(np.array([0.34, 0.84]))
 
-# Calculate the CDF values at these points
-cdf_point_of_34 = dist.cdf(point_of_34)
-cdf_point_of_84 = dist.cdf(point_of_84)
+# The CDF values at these points are the percentiles themselves
+cdf_point_of_34 = 0.34
+cdf_point_of_84 = 0.84
+pdf_point_of_34, pdf_point_of_84 = pdf(np.array([point_of_34, point_of_84]))
 
 # Calculate the probabilities
 prob_between_point_of_34_and_point_of_84 = cdf_point_of_84 - cdf_point_of_34
@@ -43,55 +127,71 @@ print(f"Probability of being greater than 84th percentile: {prob_greater_than_po
 print(f"Probability of being less than 34th percentile: {prob_less_than_point_of_34:.2f}")
 print("-----End calculating probability under percentiles-----\n\n")
 
-print("-----Start Visualizing-----")
-# Define the range of values
-x_values = np.linspace(min(speed) - 10, max(speed) + 20, 1000)
-
-# Calculate the PDF values
-pdf_values = dist.pdf(x_values)
-
-# Plot the PDF and highlight areas
-plt.figure(figsize=(12, 12))
-
-# Plot 1: PDF, CDF with highlighted areas for 86 and 99
-plt.subplot(1, 2, 1)
-sns.lineplot(x=x_values, y=pdf_values, color='blue', label='PDF')
-plt.fill_between(np.linspace(86, 99, 1000), dist.pdf(np.linspace(86, 99, 1000)), color='orange', alpha=0.3, label=f'P(86 ≤ X ≤ 99) = {prob_between_86_and_99:.2f}')
-plt.fill_between(np.linspace(99, max(speed)+10, 1000), dist.pdf(np.linspace(99, max(speed)+10, 1000)), color='green', alpha=0.3, label=f'P(X > 99) = {prob_greater_than_99:.2f}')
-plt.fill_between(np.linspace(min(speed)-10, 86, 1000), dist.pdf(np.linspace(min(speed)-10, 86, 1000)), color='red', alpha=0.3, label=f'P(X < 86) = {prob_less_than_86:.2f}')
-plt.scatter([86, 99], [dist.pdf(86), dist.pdf(99)], color='black')
-plt.text(86, dist.pdf(86), f'86\nPDF: {dist.pdf(86):.2f}\n CDF: {cdf_86: .2f}', color='black', ha='right', va='bottom')
-plt.text(99, dist.pdf(99), f'99\nPDF: {dist.pdf(99):.2f}\n CDF: {cdf_99: .2f}', color='black', ha='left', va='bottom')
-plt.text(92.5, 0.02, f'{prob_between_86_and_99:.2f}', color='orange', ha='center')
-plt.text(105, 0.005, f'{prob_greater_than_99:.2f}', color='green', ha='center')
-plt.text(75, 0.005, f'{prob_less_than_86:.2f}', color='red', ha='center')
-plt.xlabel('Speed')
-plt.ylabel('PDF')
-plt.title('Probability Under Points')
-plt.legend()
-plt.grid(True)
-plt.ylim(bottom=0)
-plt.tight_layout()
-
-# Plot 2: PDF, PPF with highlighted areas for 34% and 84%
-plt.subplot(1, 2, 2)
-sns.lineplot(x=x_values, y=pdf_values, color='blue', label='PDF')
-plt.fill_between(np.linspace(point_of_34, point_of_84, 1000), dist.pdf(np.linspace(point_of_34, point_of_84, 1000)), color='orange', alpha=0.3, label=f'P(34th ≤ X ≤ 84th) = {prob_between_point_of_34_and_point_of_84:.2f}')
-plt.fill_between(np.linspace(point_of_84, max(x_values), 1000), dist.pdf(np.linspace(point_of_84, max(x_values), 1000)), color='green', alpha=0.3, label=f'P(X > 84th) = {prob_greater_than_point_of_84:.2f}')
-plt.fill_between(np.linspace(min(x_values), point_of_34, 1000), dist.pdf(np.linspace(min(x_values), point_of_34, 1000)), color='red', alpha=0.3, label=f'P(X < 34th) = {prob_less_than_point_of_34:.2f}')
-plt.scatter([point_of_34, point_of_84], [dist.pdf(point_of_34), dist.pdf(point_of_84)], color='black')
-plt.text(point_of_34, dist.pdf(point_of_34), f'34th\nPDF: {dist.pdf(point_of_34):.2f}\n CDF: {cdf_point_of_34: .2f}', color='black', ha='right', va='bottom')
-plt.text(point_of_84, dist.pdf(point_of_84), f'84th\nPDF: {dist.pdf(point_of_84):.2f}\n CDF: {cdf_point_of_84: .2f}', color='black', ha='left', va='bottom')
-plt.text(np.mean(x_values) - 7, 0.02, f'{prob_between_point_of_34_and_point_of_84:.2f}', color='orange', ha='center')
-plt.text(np.max(x_values) - 26, 0.005, f'{prob_greater_than_point_of_84:.2f}', color='green', ha='center')
-plt.text(np.min(x_values) + 10, 0.005, f'{prob_less_than_point_of_34:.2f}', color='red', ha='center')
-plt.xlabel('Speed')
-plt.ylabel('PDF')
-plt.title('Probability Under Percentiles')
-plt.legend()
-plt.grid(True)
-plt.ylim(bottom=0)
-plt.tight_layout()
-
-plt.show()
-print("-----End Visualizing-----")
\ No newline at end of file
+if plot:
+    # Plotting libraries are only needed when plotting
+    import matplotlib.pyplot as plt
+
+    print("-----Start Visualizing-----")
+    # Define the range of values
+    speed_min, speed_max = speed.min(), speed.max()
+    x_start, x_end = speed_min - 10, speed_max + 20
+    x_values = np.linspace(x_start, x_end, 256)  # Close to the pixel width of each subplot, more points add no detail
+    x_center = (x_start + x_end) / 2  # Mean of the evenly spaced values
+
+    # Calculate the PDF values, the highlighted areas reuse slices of them
+    pdf_values = pdf_grid(x_values, mu, sigma)
+
+    # Highlighted regions of each plot: (region curve, color, label, probability, text position)
+    regions_under_points = [
+        (grid_region(x_values, pdf_values, 86, 99), 'orange', 'P(86 ≤ X ≤ 99)', prob_between_86_and_99, (92.5, 0.02)),
+        (grid_region(x_values, pdf_values, 99, speed_max + 10), 'green', 'P(X > 99)', prob_greater_than_99, (105, 0.005)),
+        (grid_region(x_values, pdf_values, x_start, 86), 'red', 'P(X < 86)', prob_less_than_86, (75, 0.005)),
+    ]
+    regions_under_percentiles = [
+        (grid_region(x_values, pdf_values, point_of_34, point_of_84), 'orange', 'P(34th ≤ X ≤ 84th)', prob_between_point_of_34_and_point_of_84, (x_center - 7, 0.02)),
+        (grid_region(x_values, pdf_values, point_of_84, x_end), 'green', 'P(X > 84th)', prob_greater_than_point_of_84, (x_end - 26, 0.005)),
+        (grid_region(x_values, pdf_values, x_start, point_of_34), 'red', 'P(X < 34th)', prob_less_than_point_of_34, (x_start + 10, 0.005)),
+    ]
+
+    # Annotations of the marked points, formatted once
+    point_labels = {
+        "86": f'86\nPDF: {pdf_86:.2f}\n CDF: {cdf_86: .2f}',
+        "99": f'99\nPDF: {pdf_99:.2f}\n CDF: {cdf_99: .2f}',
+        "34th": f'34th\nPDF: {pdf_point_of_34:.2f}\n CDF: {cdf_point_of_34: .2f}',
+        "84th": f'84th\nPDF: {pdf_point_of_84:.2f}\n CDF: {cdf_point_of_84: .2f}',
+    }
+
+    # Plot the PDF and highlight areas
+    plt.figure(figsize=(12, 12))
+
+    # Plot 1: PDF, CDF with highlighted areas for 86 and 99
+    ax = plt.subplot(1, 2, 1)
+    plt.plot(x_values, pdf_values, color='blue', label='PDF')
+    fill_regions(ax, regions_under_points)
+    plt.scatter([86, 99], [pdf_86, pdf_99], color='black')
+    plt.text(86, pdf_86, point_labels["86"], color='black', ha='right', va='bottom')
+    plt.text(99, pdf_99, point_labels["99"], color='black', ha='left', va='bottom')
+    plt.xlabel('Speed')
+    plt.ylabel('PDF')
+    plt.title('Probability Under Points')
+    plt.legend()
+    plt.grid(True)
+    plt.ylim(bottom=0)
+
+    # Plot 2: PDF, PPF with highlighted areas for 34% and 84%
+    ax = plt.subplot(1, 2, 2)
+    plt.plot(x_values, pdf_values, color='blue', label='PDF')
+    fill_regions(ax, regions_under_percentiles)
+    plt.scatter([point_of_34, point_of_84], [pdf_point_of_34, pdf_point_of_84], color='black')
+    plt.text(point_of_34, pdf_point_of_34, point_labels["34th"], color='black', ha='right', va='bottom')
+    plt.text(point_of_84, pdf_point_of_84, point_labels["84th"], color='black', ha='left', va='bottom')
+    plt.xlabel('Speed')
+    plt.ylabel('PDF')
+    plt.title('Probability Under Percentiles')
+    plt.legend()
+    plt.grid(True)
+    plt.ylim(bottom=0)
+
+    plt.tight_layout()  # Layout the whole figure once both subplots are drawn
+    plt.show()
+    print("-----End Visualizing-----")